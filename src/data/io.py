@@ -1,6 +1,19 @@
 import os
+import time
+import uuid
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Opciones de escritura de Parquet: zstd comprime mejor que snappy los textos de
+# los anuncios a una velocidad similar y la codificación por diccionario
+# aprovecha las columnas con muchos valores repetidos (orientación, calefacción)
+_PARQUET_WRITE_OPTIONS = ds.ParquetFileFormat().make_write_options(
+    compression="zstd", compression_level=3, use_dictionary=True
+)
+_ROW_GROUP_SIZE = 65536
 
 
 def save_df_to_parquet(
@@ -9,6 +22,10 @@ def save_df_to_parquet(
     """
     Guarda un DataFrame en formato Parquet en la ruta especificada.
 
+    El DataFrame se guarda como un dataset de Parquet: un directorio con el
+    nombre indicado que contiene uno o varios archivos (fragmentos). Se puede
+    leer igual que un único archivo con pd.read_parquet.
+
     Parameters
     ----------
     dataframe_to_save : pd.DataFrame
@@ -18,9 +35,13 @@ def save_df_to_parquet(
     name : str
         El nombre del archivo Parquet (incluyendo la extensión .parquet).
     replace : bool, optional
-        Si es True y el archivo ya existe, concatena el nuevo DataFrame
-        con el existente y guarda el resultado. Si es False, sobrescribe
-        el archivo existente. Por defecto es False.
+        Si es True y el archivo ya existe, añade el nuevo DataFrame como un
+        fragmento más del dataset, sin leer ni reescribir los datos existentes,
+        siempre que sus columnas se puedan convertir al esquema ya guardado.
+        Si no es así (columnas nuevas, tipos distintos o claves nuevas en las
+        columnas anidadas), concatena el nuevo DataFrame con el existente y
+        reescribe el dataset con un esquema común. Si es False, sobrescribe el
+        archivo existente. Por defecto es False.
 
     Returns
     -------
@@ -34,20 +55,88 @@ def save_df_to_parquet(
     # Definir el path de DataFrame a guardar
     file_path = os.path.join(dest_path, name)
 
-    # Verificar si el path existe
-    if os.path.exists(file_path):
+    # Las versiones anteriores guardaban un único archivo en file_path
+    if os.path.isfile(file_path):
         if replace:
-            # Si existe y el flag replace es True. Cargar los datos que están y
-            # concatenarlos con el dataframe a guardar. Guardar el nuevo DataFrame
-            # con las filas actualizadas
-            existing_df = pd.read_parquet(file_path)
-            updated_df = pd.concat([existing_df, dataframe_to_save])
-            updated_df.to_parquet(file_path)
+            # Si se van a añadir filas, convertir el archivo en el primer
+            # fragmento del dataset sin necesidad de leerlo
+            legacy_path = file_path + ".tmp"
+            os.replace(file_path, legacy_path)
+            os.makedirs(file_path)
+            os.replace(legacy_path, os.path.join(file_path, "part-0.parquet"))
         else:
-            # Si existe y el flag replace se reescribe el DataFrame
-            dataframe_to_save.to_parquet(file_path)
-    else:
-        # Si no existe, se crea la carpeta dest_path si no existe y se guarda
-        # el DataFrame ahí
-        os.makedirs(dest_path, exist_ok=True)
-        dataframe_to_save.to_parquet(file_path)
+            # Si se va a sobrescribir, basta con eliminarlo
+            os.remove(file_path)
+
+    table = pa.Table.from_pandas(dataframe_to_save, preserve_index=False)
+    append = replace and os.path.isdir(file_path)
+
+    # pd.read_parquet lee todos los fragmentos con el esquema del primero, así
+    # que el fragmento nuevo debe poder convertirse a ese esquema sin perder
+    # información (pyarrow descarta sin avisar las claves nuevas de un struct)
+    if append:
+        existing_files = sorted(ds.dataset(file_path, format="parquet").files)
+        if existing_files:
+            existing_schema = pq.read_schema(existing_files[0])
+            # Esquema que admite ambos tipos en cada columna (p. ej.
+            # null -> string, int64 -> double o structs con la unión de claves)
+            schema = pa.unify_schemas(
+                [existing_schema, table.schema], promote_options="permissive"
+            )
+            if schema.equals(existing_schema):
+                table = table.cast(existing_schema)
+            else:
+                # Concatenar los datos existentes con los nuevos y reescribir
+                # el dataset con el esquema común
+                table = _merge_with_existing(existing_files, schema, dataframe_to_save)
+                append = False
+
+    # El nombre del fragmento empieza por la marca de tiempo para que los
+    # fragmentos se lean en el orden en que se añadieron (el archivo antiguo,
+    # part-0, queda el primero) y el uuid lo hace único
+    basename = f"part-{time.time_ns():020d}-{uuid.uuid4().hex}"
+
+    # Si se añaden filas se crea un fragmento nuevo y se conservan los
+    # existentes. Si no, se eliminan los fragmentos previos. En ambos casos se
+    # crea la carpeta dest_path si no existe.
+    ds.write_dataset(
+        table,
+        base_dir=file_path,
+        format="parquet",
+        file_options=_PARQUET_WRITE_OPTIONS,
+        min_rows_per_group=_ROW_GROUP_SIZE,
+        max_rows_per_group=_ROW_GROUP_SIZE,
+        basename_template=basename + "-{i}.parquet",
+        existing_data_behavior="overwrite_or_ignore" if append else "delete_matching",
+    )
+
+
+def _merge_with_existing(
+    existing_files: list, schema: pa.Schema, dataframe_to_save: pd.DataFrame
+) -> pa.Table:
+    """
+    Concatena los fragmentos existentes con el nuevo DataFrame en una tabla
+    con el esquema indicado.
+
+    Parameters
+    ----------
+    existing_files : list
+        Rutas de los fragmentos existentes, en el orden en que se añadieron.
+    schema : pa.Schema
+        Esquema común a los fragmentos existentes y al nuevo DataFrame.
+    dataframe_to_save : pd.DataFrame
+        El DataFrame a añadir.
+
+    Returns
+    -------
+    pa.Table
+        Tabla con las filas existentes seguidas de las nuevas.
+    """
+    # pyarrow no sabe ampliar los campos de un struct con cast, así que la
+    # concatenación se hace en pandas y la conversión final usa el esquema común
+    existing_df = pd.concat(
+        [pq.read_table(path).to_pandas() for path in existing_files],
+        ignore_index=True,
+    )
+    updated_df = pd.concat([existing_df, dataframe_to_save], ignore_index=True)
+    return pa.Table.from_pandas(updated_df, schema=schema, preserve_index=False)
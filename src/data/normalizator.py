@@ -1,8 +1,88 @@
 import re
 
-import numpy as np
 import pandas as pd
 
+# Patrones de extracción de info_features, compilados una única vez al importar
+_INFO_PATTERNS = {
+    "superficie": re.compile(r"(\d+)\s*m²"),
+    "habitaciones": re.compile(r"(\d+)\s*hab"),
+    "garaje_incluido": re.compile(r"garaje incluido"),
+    "con_garaje": re.compile(r"con garaje"),
+    "planta": re.compile(r"planta (\d+)"),
+    "con_ascensor": re.compile(r"con ascensor"),
+    "sin_ascensor": re.compile(r"sin ascensor"),
+}
+
+
+def _a_enteros(valores: pd.Series) -> pd.Series:
+    """Convierte los valores extraídos a enteros admitiendo nulos."""
+    return valores.astype("Int64")
+
+
+def _a_textos(valores: pd.Series) -> pd.Series:
+    """Deja los valores extraídos como texto."""
+    return valores
+
+
+def _a_textos_sin_espacios(valores: pd.Series) -> pd.Series:
+    """Elimina los espacios al inicio y al final de los valores extraídos."""
+    return valores.str.strip()
+
+
+# Características básicas a extraer, en el orden de las columnas de salida. Cada
+# fila contiene la columna, la regla de extracción y las conversiones del valor:
+# - Campos con valor: patrón con un único grupo de captura, conversión para un
+#   anuncio y su equivalente vectorizado para una columna de anuncios.
+# - Características que solo indican presencia: tupla de textos literales cuya
+#   aparición la activa (se comprueban con el operador in en lugar de con una
+#   regex) y sin conversiones.
+_CB_SPEC = [
+    (
+        "caracteristicas_basicas_superficie_m2",
+        r"(\d+)\s*m² construidos",
+        int,
+        _a_enteros,
+    ),
+    ("superficie_util_m2", r"(\d+)\s*m² útiles", int, _a_enteros),
+    ("caracteristicas_basicas_habitaciones", r"(\d+)\s*habitaci?", int, _a_enteros),
+    ("caracteristicas_basicas_banos", r"(\d+)\s*baños?", int, _a_enteros),
+    ("parcela_m2", r"parcela de (\d+)\s*m²", int, _a_enteros),
+    ("terraza", ("terraza",), None, None),
+    ("balcon", ("balcón",), None, None),
+    ("garaje_incluido", ("plaza de garaje incluida en el precio",), None, None),
+    ("segunda_mano_buen_estado", ("segunda mano/buen estado",), None, None),
+    ("armarios_empotrados", ("armarios empotrados",), None, None),
+    ("orientacion", r"orientación (\w+(?:, \w+)*)", str, _a_textos),
+    ("cocina_equipada", ("cocina equipada",), None, None),
+    ("amueblada", ("casa sin amueblar", "amueblado"), None, None),
+    ("calefaccion", r"calefacción\s*([\w\s:]+)", str.strip, _a_textos_sin_espacios),
+    ("trastero", ("trastero",), None, None),
+    ("construccion", r"construido en (\d{4})", int, _a_enteros),
+    ("plantas", r"(\d+)\s*plantas", int, _a_enteros),
+]
+
+# Tablas derivadas de _CB_SPEC: columnas de salida en orden, campos con valor
+# y características de presencia
+_CB_COLUMNS = [columna for columna, _, _, _ in _CB_SPEC]
+_CB_FIELDS = [campo for campo in _CB_SPEC if isinstance(campo[1], str)]
+_CB_FLAGS = {
+    columna: literales
+    for columna, literales, _, _ in _CB_SPEC
+    if isinstance(literales, tuple)
+}
+
+# Expresión única con todos los campos de _CB_FIELDS, generada una sola vez al
+# importar. El grupo g{i} identifica el campo i de la tabla y su valor queda en
+# el grupo siguiente. Cada alternativa va dentro de un lookahead para que un
+# patrón no consuma el texto de los siguientes (p. ej. la calefacción captura
+# hasta el final del texto) y todos se evalúen en una sola pasada. Solo la usa
+# la extracción de un único anuncio (extract_caracteristicas_basicas).
+_CB_MASTER = re.compile(
+    "|".join(
+        f"(?=(?P<g{i}>{patron}))" for i, (_, patron, _, _) in enumerate(_CB_FIELDS)
+    )
+)
+
 
 class NormalizarDataFrame:
     """
@@ -18,10 +98,18 @@ class NormalizarDataFrame:
     -------
     extract_info_features(info)
         Extrae características de información del anuncio inmobiliario.
-    filter_energy_data(data)
-        Filtra los datos de energía para conservar solo los relevantes.
     extract_certificado_energetico(data)
         Extrae la información del certificado energético del anuncio.
+    extract_caracteristicas_basicas(caracteristicas_basicas)
+        Extrae las características básicas del anuncio inmobiliario.
+    extract_info_features_columns(info)
+        Extrae de forma vectorizada las características de información de una
+        columna de anuncios.
+    extract_caracteristicas_basicas_columns(texto)
+        Extrae de forma vectorizada las características básicas de una columna
+        de anuncios.
+    normalizar_precios(df)
+        Normaliza las columnas de precios del DataFrame.
     normalize_dataframe()
         Normaliza el DataFrame aplicando las funciones de extracción y
         crea nuevas columnas con la información extraída.
@@ -42,6 +130,9 @@ class NormalizarDataFrame:
         """
         Extrae características de información del anuncio inmobiliario.
 
+        Procesa un único anuncio. normalize_dataframe usa en su lugar la
+        versión vectorizada, extract_info_features_columns.
+
         Parameters
         ----------
         info : list
@@ -58,28 +149,20 @@ class NormalizarDataFrame:
         # Convertir a lowercase
         info = info.lower()
 
-        # Definir los patrones de extracción
-        superficie_pattern = re.compile(r"(\d+)\s*m²")
-        habitaciones_pattern = re.compile(r"(\d+)\s*hab")
-        garaje_incluido_pattern = re.compile(r"garaje incluido")
-        con_garaje_pattern = re.compile(r"con garaje")
-        planta_pattern = re.compile(r"planta (\d+)")
-        con_ascensor_pattern = re.compile(r"con ascensor")
-        sin_ascensor_pattern = re.compile(r"sin ascensor")
-
         # Extraer la información
-        superficie = superficie_pattern.search(info)
-        habitaciones = habitaciones_pattern.search(info)
+        superficie = _INFO_PATTERNS["superficie"].search(info)
+        habitaciones = _INFO_PATTERNS["habitaciones"].search(info)
         garaje = (
             True
-            if garaje_incluido_pattern.search(info) or con_garaje_pattern.search(info)
+            if _INFO_PATTERNS["garaje_incluido"].search(info)
+            or _INFO_PATTERNS["con_garaje"].search(info)
             else False
         )
-        planta = planta_pattern.search(info)
+        planta = _INFO_PATTERNS["planta"].search(info)
 
-        if con_ascensor_pattern.search(info):
+        if _INFO_PATTERNS["con_ascensor"].search(info):
             ascensor = True
-        elif sin_ascensor_pattern.search(info):
+        elif _INFO_PATTERNS["sin_ascensor"].search(info):
             ascensor = False
         else:
             ascensor = None
@@ -92,30 +175,6 @@ class NormalizarDataFrame:
             "ascensor": ascensor,
         }
 
-    def filter_energy_data(self, data: list) -> list:
-        """
-        Filtra los datos de energía para conservar solo los relevantes.
-
-        Parameters
-        ----------
-        data : list
-            Lista de diccionarios con la información energética.
-
-        Returns
-        -------
-        list
-            Lista de diccionarios filtrados con la información energética relevante.
-        """
-        filtered_data = []
-        for item in data:
-            filtered_item = {
-                key: value
-                for key, value in item.items()
-                if key in ["Consumo:", "Emisiones:"] and value is not None
-            }
-            filtered_data.append(filtered_item)
-        return filtered_data
-
     def extract_certificado_energetico(self, data: list) -> dict:
         """
         Extrae la información del certificado energético del anuncio.
@@ -138,26 +197,25 @@ class NormalizarDataFrame:
             None,
         )
 
-        # Filtrar la información necesaria
-        certificado = self.filter_energy_data(data)
-
-        # Verificar y extraer la información de la lista de diccionarios
-        for item in certificado:
-            if "Consumo:" in item and item["Consumo:"] is not None:
-                consumo = item["Consumo:"]
-                if isinstance(consumo, np.ndarray):
-                    if consumo[0]:  # Verificar si el primer elemento no está vacío
-                        consumo_valor = consumo[0]
-                    if consumo[1]:  # Verificar si el segundo elemento no está vacío
-                        consumo_icono = consumo[1]
-
-            if "Emisiones:" in item and item["Emisiones:"] is not None:
-                emisiones = item["Emisiones:"]
-                if isinstance(emisiones, np.ndarray):
-                    if emisiones[0]:  # Verificar si el primer elemento no está vacío
-                        emisiones_valor = emisiones[0]
-                    if emisiones[1]:  # Verificar si el segundo elemento no está vacío
-                        emisiones_icono = emisiones[1]
+        # Verificar y extraer la información de la lista de diccionarios. Solo
+        # interesan las claves de consumo y emisiones con algún valor.
+        for item in data:
+            # Cada valor es un par [valor, icono] generado por el scraper
+            consumo = item.get("Consumo:")
+            if consumo is not None:
+                valor, icono = consumo
+                if valor:  # Verificar si el valor no está vacío
+                    consumo_valor = valor
+                if icono:  # Verificar si el icono no está vacío
+                    consumo_icono = icono
+
+            emisiones = item.get("Emisiones:")
+            if emisiones is not None:
+                valor, icono = emisiones
+                if valor:  # Verificar si el valor no está vacío
+                    emisiones_valor = valor
+                if icono:  # Verificar si el icono no está vacío
+                    emisiones_icono = icono
 
         return {
             "consumo_energetico_valor": consumo_valor,
@@ -171,6 +229,9 @@ class NormalizarDataFrame:
         Extrae las características básicas de una propiedad desde
         una lista de descripciones.
 
+        Procesa un único anuncio. normalize_dataframe usa en su lugar la
+        versión vectorizada, extract_caracteristicas_basicas_columns.
+
         Parameters
         ----------
         caracteristicas_basicas : list
@@ -183,72 +244,94 @@ class NormalizarDataFrame:
         """
         caracteristicas_basicas = " ".join(caracteristicas_basicas).lower()
 
-        # Patrones de búsqueda
-        superficie_pattern = re.compile(r"(\d+)\s*m² construidos")
-        superficie_util_pattern = re.compile(r"(\d+)\s*m² útiles")
-        habitaciones_pattern = re.compile(r"(\d+)\s*habitaci?")
-        banos_pattern = re.compile(r"(\d+)\s*baños?")
-        parcela_pattern = re.compile(r"parcela de (\d+)\s*m²")
-        terraza_pattern = re.compile(r"terraza")
-        balcon_pattern = re.compile(r"balcón")
-        garaje_pattern = re.compile(r"plaza de garaje incluida en el precio")
-        estado_pattern = re.compile(r"segunda mano/buen estado")
-        armarios_pattern = re.compile(r"armarios empotrados")
-        orientacion_pattern = re.compile(r"orientación (\w+(?:, \w+)*)")
-        cocina_pattern = re.compile(r"cocina equipada")
-        casas_amueblada_pattern = re.compile(r"casa sin amueblar")
-        amueblado_pattern = re.compile(r"amueblado")
-        calefaccion_pattern = re.compile(r"calefacción\s*([\w\s:]+)")
-        trastero_pattern = re.compile(r"trastero")
-        construccion_pattern = re.compile(r"construido en (\d{4})")
-        plantas_pattern = re.compile(r"(\d+)\s*plantas")
-
-        # Extracción de datos
-        superficie = superficie_pattern.search(caracteristicas_basicas)
-        superficie_util = superficie_util_pattern.search(caracteristicas_basicas)
-        habitaciones = habitaciones_pattern.search(caracteristicas_basicas)
-        banos = banos_pattern.search(caracteristicas_basicas)
-        parcela = parcela_pattern.search(caracteristicas_basicas)
-        terraza = bool(terraza_pattern.search(caracteristicas_basicas))
-        balcon = bool(balcon_pattern.search(caracteristicas_basicas))
-        garaje = bool(garaje_pattern.search(caracteristicas_basicas))
-        estado = bool(estado_pattern.search(caracteristicas_basicas))
-        armarios = bool(armarios_pattern.search(caracteristicas_basicas))
-        orientacion = orientacion_pattern.search(caracteristicas_basicas)
-        cocina = bool(cocina_pattern.search(caracteristicas_basicas))
-        amueblada = bool(
-            casas_amueblada_pattern.search(caracteristicas_basicas)
-        ) or bool(amueblado_pattern.search(caracteristicas_basicas))
-        calefaccion = calefaccion_pattern.search(caracteristicas_basicas)
-        trastero = bool(trastero_pattern.search(caracteristicas_basicas))
-        construccion = construccion_pattern.search(caracteristicas_basicas)
-        plantas = plantas_pattern.search(caracteristicas_basicas)
+        # Recorrer el texto una única vez. Se conserva la primera coincidencia de
+        # cada campo, igual que haría una búsqueda individual.
+        resultado = dict.fromkeys(_CB_COLUMNS)
+        for match in _CB_MASTER.finditer(caracteristicas_basicas):
+            columna, _, conversion, _ = _CB_FIELDS[int(match.lastgroup[1:])]
+            if resultado[columna] is None:
+                resultado[columna] = conversion(match.group(match.lastindex + 1))
 
-        return {
-            "caracteristicas_basicas_superficie_m2": (
-                int(superficie.group(1)) if superficie else None
-            ),
-            "superficie_util_m2": (
-                int(superficie_util.group(1)) if superficie_util else None
-            ),
-            "caracteristicas_basicas_habitaciones": (
-                int(habitaciones.group(1)) if habitaciones else None
-            ),
-            "caracteristicas_basicas_banos": int(banos.group(1)) if banos else None,
-            "parcela_m2": int(parcela.group(1)) if parcela else None,
-            "terraza": terraza,
-            "balcon": balcon,
-            "garaje_incluido": garaje,
-            "segunda_mano_buen_estado": estado,
-            "armarios_empotrados": armarios,
-            "orientacion": orientacion.group(1) if orientacion else None,
-            "cocina_equipada": cocina,
-            "amueblada": amueblada,
-            "calefaccion": calefaccion.group(1).strip() if calefaccion else None,
-            "trastero": trastero,
-            "construccion": int(construccion.group(1)) if construccion else None,
-            "plantas": int(plantas.group(1)) if plantas else None,
-        }
+        for columna, literales in _CB_FLAGS.items():
+            resultado[columna] = any(
+                literal in caracteristicas_basicas for literal in literales
+            )
+
+        return resultado
+
+    def extract_info_features_columns(self, info: pd.Series) -> pd.DataFrame:
+        """
+        Extrae de forma vectorizada las características de información de
+        todos los anuncios de una columna.
+
+        Parameters
+        ----------
+        info : pd.Series
+            Columna con la información de cada anuncio unida en un único texto
+            en lowercase.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame con una columna por cada característica extraída.
+        """
+        con_ascensor = info.str.contains(_INFO_PATTERNS["con_ascensor"].pattern)
+        sin_ascensor = info.str.contains(_INFO_PATTERNS["sin_ascensor"].pattern)
+        ascensor = pd.Series(pd.NA, index=info.index, dtype="boolean")
+        ascensor[sin_ascensor] = False
+        ascensor[con_ascensor] = True
+
+        return pd.DataFrame(
+            {
+                "superficie_m2": info.str.extract(
+                    _INFO_PATTERNS["superficie"], expand=False
+                ).astype("Int64"),
+                "habitaciones": info.str.extract(
+                    _INFO_PATTERNS["habitaciones"], expand=False
+                ).astype("Int64"),
+                "garaje": info.str.contains(_INFO_PATTERNS["garaje_incluido"].pattern)
+                | info.str.contains(_INFO_PATTERNS["con_garaje"].pattern),
+                "planta": info.str.extract(
+                    _INFO_PATTERNS["planta"], expand=False
+                ).astype("Int64"),
+                "ascensor": ascensor,
+            },
+            index=info.index,
+        )
+
+    def extract_caracteristicas_basicas_columns(self, texto: pd.Series) -> pd.DataFrame:
+        """
+        Extrae de forma vectorizada las características básicas de todos los
+        anuncios de una columna.
+
+        Parameters
+        ----------
+        texto : pd.Series
+            Columna con las características básicas de cada anuncio unidas en
+            un único texto en lowercase.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame con una columna por cada característica extraída.
+        """
+
+        columnas = {}
+        for columna, regla, _, conversion_vectorizada in _CB_SPEC:
+            if isinstance(regla, str):
+                valores = texto.str.extract(regla, expand=False)
+                columnas[columna] = conversion_vectorizada(valores)
+            else:
+                # La columna se activa si aparece cualquiera de sus literales
+                coincidencias = [
+                    texto.str.contains(literal, regex=False) for literal in regla
+                ]
+                valores = coincidencias[0]
+                for coincidencia in coincidencias[1:]:
+                    valores = valores | coincidencia
+                columnas[columna] = valores
+
+        return pd.DataFrame(columnas, index=texto.index)
 
     def normalizar_precios(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -256,11 +339,14 @@ class NormalizarDataFrame:
 
         Esta función procesa el DataFrame dado para normalizar las
         columnas de precios mediante:
-        - Eliminar los puntos de la columna 'precio_inmueble' y
-            convertirla a un entero.
+        - Eliminar todo lo que no sea un dígito o un signo (puntos, espacios,
+          espacios no separables y la unidad) de la columna 'precio_inmueble'
+          y convertirla a un entero.
         - Multiplicar la columna 'price' por 1000.
-        - Reemplazar comas por puntos en la columna 'precio_m2' y
-          convertirla a un flotante.
+        - Eliminar todo lo que no sea un dígito, una coma o un signo de la
+          columna 'precio_m2', reemplazar la coma decimal por un punto y
+          convertirla a un flotante. Los puntos son separadores de miles:
+          "2.083,33 €/m²" se convierte en 2083.33 (antes se obtenía 2.083).
 
         Parameters
         ----------
@@ -271,17 +357,26 @@ class NormalizarDataFrame:
         -------
         pd.DataFrame: El DataFrame con las columnas de precios normalizadas.
         """
-        return df.assign(
-            precio_inmueble=lambda x: x["precio_inmueble"]
-            .str.replace(".", "", regex=False)
-            .str.extract(r"(\d+)")
-            .astype("int64"),
-            price=lambda x: x["price"].astype("float64") * 1000,
-            precio_m2=lambda x: x["precio_m2"]
-            .str.replace(",", ".", regex=False)
-            .str.extract(r"(\d+\.?\d*)")
-            .astype("float64"),
+        # Los precios llegan con el formato "250.000 €" o "12,50 €/m²", aunque el
+        # espacio antes de la unidad puede ser no separable o no estar. Basta con
+        # quitar todo salvo los dígitos para que pd.to_numeric los convierta.
+        # Copia superficial en lugar de df.assign, que copia todas las columnas:
+        # solo se sustituyen las tres columnas de precios y df no se modifica
+        df = df.copy(deep=False)
+        df["precio_inmueble"] = pd.to_numeric(
+            df["precio_inmueble"].str.replace(r"[^0-9+-]", "", regex=True),
+            errors="coerce",
+        ).astype("Int64")
+        # Operar directamente sobre el array de NumPy evita el despacho de
+        # pandas para una operación puramente numérica
+        df["price"] = df["price"].to_numpy(dtype="float64") * 1000
+        df["precio_m2"] = pd.to_numeric(
+            df["precio_m2"]
+            .str.replace(r"[^0-9,+-]", "", regex=True)
+            .str.replace(",", ".", regex=False),
+            errors="coerce",
         )
+        return df
 
     def normalize_dataframe(self) -> pd.DataFrame:
         """
@@ -293,33 +388,57 @@ class NormalizarDataFrame:
         pd.DataFrame
             DataFrame normalizado con las nuevas columnas de información extraída.
         """
-        df_info_features = self.dataframe["info_features"].apply(
-            lambda x: pd.Series(self.extract_info_features(x))
-        )
-        df_certificado_energetico = self.dataframe["certificado_energetico"].apply(
-            lambda x: pd.Series(self.extract_certificado_energetico(x))
+        # Copia superficial: las columnas se eliminan y asignan sobre df sin
+        # copiar los datos y sin modificar el atributo dataframe, de modo que el
+        # método se puede volver a llamar
+        df = self.dataframe.copy(deep=False)
+
+        # Generar una única vez el texto en lowercase de cada columna de listas
+        # para pasarlo a las extracciones vectorizadas. El texto se guarda con
+        # el dtype de strings respaldado por Arrow para que el paso a lowercase
+        # y las búsquedas de texto se ejecuten con los kernels de pyarrow.
+        info_lower = (
+            df["info_features"].map(" ".join).astype("string[pyarrow]").str.lower()
         )
-        df_caracteristicas_basicas = self.dataframe["caracteristicas_basicas"].apply(
-            lambda x: pd.Series(self.extract_caracteristicas_basicas(x))
+        cb_lower = (
+            df["caracteristicas_basicas"]
+            .map(" ".join)
+            .astype("string[pyarrow]")
+            .str.lower()
         )
 
-        dataframe_normalizado = pd.concat(
+        df_info_features = self.extract_info_features_columns(info_lower)
+        # El certificado energético es una lista de diccionarios por anuncio, por
+        # lo que se extrae fila a fila pero construyendo un único DataFrame
+        df_certificado_energetico = pd.DataFrame(
             [
-                self.dataframe.drop(
-                    columns=[
-                        "info_features",
-                        "certificado_energetico",
-                        "caracteristicas_basicas",
-                    ]
-                ),
-                df_info_features,
-                df_certificado_energetico,
-                df_caracteristicas_basicas,
+                self.extract_certificado_energetico(certificado)
+                for certificado in df["certificado_energetico"]
             ],
-            axis=1,
+            index=df.index,
+        )
+        df_caracteristicas_basicas = self.extract_caracteristicas_basicas_columns(
+            cb_lower
         )
 
-        dataframe_normalizado.rename(
+        # Sustituir las columnas originales por las extraídas, sin concatenar
+        # (pd.concat copiaría todas las columnas). Se eliminan con del porque
+        # drop reconstruye los bloques de datos del DataFrame copiándolos.
+        for columna in (
+            "info_features",
+            "certificado_energetico",
+            "caracteristicas_basicas",
+        ):
+            del df[columna]
+        for df_extraido in (
+            df_info_features,
+            df_certificado_energetico,
+            df_caracteristicas_basicas,
+        ):
+            for nombre, columna in df_extraido.items():
+                df[nombre] = columna
+
+        df.rename(
             columns={
                 "Precio del inmueble:": "precio_inmueble",
                 "Precio por m²:": "precio_m2",
@@ -327,6 +446,4 @@ class NormalizarDataFrame:
             inplace=True,
         )
 
-        dataframe_normalizado = self.normalizar_precios(dataframe_normalizado)
-
-        return dataframe_normalizado
+        return self.normalizar_precios(df)
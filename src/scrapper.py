@@ -1,6 +1,29 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
+
+# Sesión HTTP compartida por todos los scrapers para reutilizar las conexiones
+# (keep-alive) en lugar de abrir una conexión TCP+TLS nueva por anuncio. El
+# tamaño del pool cubre las peticiones concurrentes de scrape_many.
+if os.environ.get("IDEALISTA_HTTP_CACHE"):
+    # Durante el desarrollo se pueden cachear las respuestas en disco (SQLite)
+    # durante una hora para no repetir peticiones a las mismas URLs
+    import requests_cache
+
+    _SESSION = requests_cache.CachedSession(
+        "idealista_cache", backend="sqlite", expire_after=3600
+    )
+else:
+    _SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+# Instancia única de UserAgent: cargar su base de datos de navegadores es costoso,
+# así que solo se genera un User-Agent aleatorio nuevo por cada scraper
+_UA = UserAgent()
 
 
 class IdealistaScraper:
@@ -43,14 +66,18 @@ class IdealistaScraper:
         Obtiene las características de precio del anuncio.
     get_ubicacion()
         Obtiene la ubicación del anuncio.
+    parse_document()
+        Extrae toda la información del anuncio recorriendo el HTML una sola vez.
     scrape()
         Realiza todo el proceso de scraping y devuelve la información del anuncio.
+    scrape_many(urls, max_workers=4)
+        Realiza el scraping de varios anuncios de forma concurrente.
     """
 
     def __init__(self, url):
         self.url = url
         self.headers = {
-            "User-Agent": UserAgent().random,
+            "User-Agent": _UA.random,
             "Accept-Language": "en-US,en;q=0.9",
             "Accept-Encoding": "gzip, deflate, br",
             "Connection": "keep-alive",
@@ -70,9 +97,9 @@ class IdealistaScraper:
         ValueError
             Si la solicitud HTTP falla.
         """
-        response = requests.get(self.url, headers=self.headers, timeout=120)
+        response = _SESSION.get(self.url, headers=self.headers, timeout=120)
         if response.status_code == 200:
-            self.soup = BeautifulSoup(response.content, "html.parser")
+            self.soup = BeautifulSoup(response.content, "lxml")
         else:
             raise ValueError(
                 f"Failed to fetch page with status code: {response.status_code}"
@@ -88,31 +115,27 @@ class IdealistaScraper:
         """
         Obtiene la referencia del anuncio y la guarda en announcement_info.
         """
-        reference_tags = self.soup.find_all("p", class_="txt-ref")
-        for ref_tag in reference_tags:
-            ref_number = ref_tag.text.strip()
-            self.announcement_info["referencia_anuncio"] = ref_number
+        ref_tag = self.soup.find("p", class_="txt-ref")
+        if ref_tag:
+            self._parse_reference(ref_tag)
 
     def get_price(self):
         """
         Obtiene el precio del anuncio y lo guarda en announcement_info.
         """
-        info_data_divs = self.soup.find_all("div", class_="info-data")
-        for info_div in info_data_divs:
-            price_span = info_div.find("span", class_="info-data-price")
-            if price_span:
-                price = price_span.find("span", class_="txt-bold").text.strip()
-                self.announcement_info["price"] = price
+        for info_div in self.soup.find_all("div", class_="info-data"):
+            self._parse_price(info_div)
+            # Quedarse con el primer div que contenga el precio
+            if "price" in self.announcement_info:
+                break
 
     def get_info_features(self):
         """
         Obtiene las características de información del anuncio y las guarda en
         announcement_info.
         """
-        info_features_divs = self.soup.find_all("div", class_="info-features")
-        for features_div in info_features_divs:
-            features = [span.text.strip() for span in features_div.find_all("span")]
-            self.announcement_info["info_features"] = features
+        for features_div in self.soup.find_all("div", class_="info-features"):
+            self._parse_info_features(features_div)
 
     def get_caracteristicas_basicas(self):
         """
@@ -120,17 +143,7 @@ class IdealistaScraper:
         """
         details_div = self.soup.find("div", class_="details-property-feature-one")
         if details_div:
-            headings = details_div.find_all("h2", class_="details-property-h2")
-            for heading in headings:
-                if "Características básicas" in heading.text:
-                    next_div = heading.find_next_sibling(
-                        "div", class_="details-property_features"
-                    )
-                    if next_div:
-                        ul_tags = next_div.find_all("ul")
-                        for ul in ul_tags:
-                            items = [li.text.strip() for li in ul.find_all("li")]
-                            self.announcement_info["caracteristicas_basicas"] = items
+            self._parse_caracteristicas_basicas(details_div)
 
     def get_certificado_energetico(self):
         """
@@ -138,26 +151,7 @@ class IdealistaScraper:
         """
         certificate_div = self.soup.find("div", class_="details-property-feature-two")
         if certificate_div:
-            headings = certificate_div.find_all("h2", class_="details-property-h2")
-            for heading in headings:
-                if "Certificado energético" in heading.text:
-                    next_div = heading.find_next_sibling(
-                        "div", class_="details-property_features"
-                    )
-                    if next_div:
-                        ul_tags = next_div.find_all("ul")
-                        items = []
-                        for li in ul_tags[0].find_all("li"):
-                            title_span = li.find_all("span")[0]
-                            value_span = li.find_all("span")[1]
-
-                            title = title_span.text.strip()
-                            value = value_span.text.strip()
-                            icon_class = value_span.get("class", [""])[0]
-
-                            items.append({title: [value, icon_class]})
-
-                        self.announcement_info["certificado_energetico"] = items
+            self._parse_certificado_energetico(certificate_div)
 
     def get_price_features(self):
         """
@@ -165,22 +159,7 @@ class IdealistaScraper:
         """
         price_article = self.soup.find("article", class_="price-feature")
         if price_article:
-            price_info = price_article.find_all("p", class_="flex-feature")
-            for p in price_info:
-                label_span = p.find("span", class_="flex-feature-details")
-                value_strong = p.find("strong", class_="flex-feature-details")
-                if value_strong:
-                    value = value_strong.get_text(strip=True)
-                else:
-                    value = (
-                        p.get_text(strip=True)
-                        .replace(label_span.get_text(strip=True), "")
-                        .strip()
-                    )
-                if label_span:
-                    label = label_span.get_text(strip=True)
-                    if "Precio del inmueble" in label or "Precio por m²" in label:
-                        self.announcement_info[label] = value
+            self._parse_price_features(price_article)
 
     def get_ubicacion(self):
         """
@@ -188,9 +167,148 @@ class IdealistaScraper:
         """
         location_div = self.soup.find("div", id="headerMap")
         if location_div:
-            location_items = location_div.find_all("li", class_="header-map-list")
-            location_info = [item.get_text(strip=True) for item in location_items]
-            self.announcement_info["ubicacion"] = location_info
+            self._parse_ubicacion(location_div)
+
+    def _parse_reference(self, ref_tag):
+        """
+        Guarda en announcement_info la referencia contenida en un tag txt-ref.
+        """
+        ref_number = ref_tag.get_text(strip=True)
+        self.announcement_info["referencia_anuncio"] = ref_number
+
+    def _parse_price(self, info_div):
+        """
+        Guarda en announcement_info el precio contenido en un div info-data.
+        """
+        price_span = info_div.find("span", class_="info-data-price")
+        if price_span:
+            price = price_span.find("span", class_="txt-bold").get_text(strip=True)
+            self.announcement_info["price"] = price
+
+    def _parse_info_features(self, features_div):
+        """
+        Guarda en announcement_info las características de un div info-features.
+        """
+        features = [span.text.strip() for span in features_div.find_all("span")]
+        self.announcement_info["info_features"] = features
+
+    def _parse_caracteristicas_basicas(self, details_div):
+        """
+        Guarda en announcement_info las características básicas de su sección.
+        """
+        headings = details_div.find_all("h2", class_="details-property-h2")
+        for heading in headings:
+            if "Características básicas" in heading.text:
+                next_div = heading.find_next_sibling(
+                    "div", class_="details-property_features"
+                )
+                if next_div:
+                    ul_tags = next_div.find_all("ul")
+                    for ul in ul_tags:
+                        items = [li.text.strip() for li in ul.find_all("li")]
+                        self.announcement_info["caracteristicas_basicas"] = items
+
+    def _parse_certificado_energetico(self, certificate_div):
+        """
+        Guarda en announcement_info el certificado energético de su sección.
+        """
+        headings = certificate_div.find_all("h2", class_="details-property-h2")
+        for heading in headings:
+            if "Certificado energético" in heading.text:
+                next_div = heading.find_next_sibling(
+                    "div", class_="details-property_features"
+                )
+                if next_div:
+                    ul_tags = next_div.find_all("ul")
+                    items = []
+                    for li in ul_tags[0].find_all("li"):
+                        title_span, value_span = li.find_all("span", limit=2)
+
+                        title = title_span.get_text(strip=True)
+                        value = value_span.get_text(strip=True)
+                        icon_class = (value_span.get("class") or [""])[0]
+
+                        items.append({title: [value, icon_class]})
+
+                    self.announcement_info["certificado_energetico"] = items
+
+    def _parse_price_features(self, price_article):
+        """
+        Guarda en announcement_info las características de precio de su sección.
+        """
+        price_info = price_article.find_all("p", class_="flex-feature")
+        for p in price_info:
+            label_span = p.find("span", class_="flex-feature-details")
+            value_strong = p.find("strong", class_="flex-feature-details")
+            if value_strong:
+                value = value_strong.get_text(strip=True)
+            else:
+                value = (
+                    p.get_text(strip=True)
+                    .replace(label_span.get_text(strip=True), "")
+                    .strip()
+                )
+            if label_span:
+                label = label_span.get_text(strip=True)
+                if "Precio del inmueble" in label or "Precio por m²" in label:
+                    self.announcement_info[label] = value
+
+    def _parse_ubicacion(self, location_div):
+        """
+        Guarda en announcement_info la ubicación contenida en el div headerMap.
+        """
+        location_items = location_div.find_all("li", class_="header-map-list")
+        location_info = [item.get_text(strip=True) for item in location_items]
+        self.announcement_info["ubicacion"] = location_info
+
+    def parse_document(self):
+        """
+        Recorre el HTML del anuncio una única vez y extrae toda la información
+        en announcement_info.
+
+        Cada tag se enruta, según su nombre y su clase o id, al método que
+        procesa esa sección del anuncio. Equivale a llamar a todos los métodos
+        get_* pero sin recorrer el documento completo en cada uno de ellos.
+        """
+        self.get_title()
+
+        routes = {
+            ("p", "txt-ref"): self._parse_reference,
+            ("div", "info-data"): self._parse_price,
+            ("div", "info-features"): self._parse_info_features,
+            ("div", "details-property-feature-one"): (
+                self._parse_caracteristicas_basicas
+            ),
+            ("div", "details-property-feature-two"): (
+                self._parse_certificado_energetico
+            ),
+            ("article", "price-feature"): self._parse_price_features,
+            ("div", "headerMap"): self._parse_ubicacion,
+        }
+        # Secciones de las que solo se procesa la primera aparición (find)
+        single_routes = {
+            ("p", "txt-ref"),
+            ("div", "details-property-feature-one"),
+            ("div", "details-property-feature-two"),
+            ("article", "price-feature"),
+            ("div", "headerMap"),
+        }
+
+        for tag in self.soup.descendants:
+            # Ignorar los nodos de texto
+            if tag.name is None:
+                continue
+            for selector in (*tag.get("class", ()), tag.get("id")):
+                handler = routes.get((tag.name, selector))
+                if handler:
+                    handler(tag)
+                    # El precio se busca en todos los div info-data hasta que
+                    # uno de ellos lo contenga
+                    if (tag.name, selector) in single_routes or (
+                        selector == "info-data" and "price" in self.announcement_info
+                    ):
+                        del routes[(tag.name, selector)]
+                    break
 
     def scrape(self):
         """
@@ -202,12 +320,44 @@ class IdealistaScraper:
             Diccionario con la información del anuncio.
         """
         self.fetch_page()
-        self.get_title()
-        self.get_reference()
-        self.get_price()
-        self.get_info_features()
-        self.get_caracteristicas_basicas()
-        self.get_certificado_energetico()
-        self.get_price_features()
-        self.get_ubicacion()
+        self.parse_document()
         return self.announcement_info
+
+    @classmethod
+    def scrape_many(cls, urls, max_workers=4):
+        """
+        Realiza el scraping de varios anuncios de forma concurrente.
+
+        Las peticiones HTTP se lanzan en paralelo desde un pool de hilos para
+        solapar la latencia de red entre anuncios. Un error en un anuncio no
+        detiene el resto: los resultados pueden ser parciales y en la posición
+        de cada anuncio fallido se devuelve la excepción que se produjo.
+
+        Parameters
+        ----------
+        urls : list
+            Lista de URLs de anuncios en Idealista.
+        max_workers : int, optional
+            Número máximo de peticiones simultáneas. Por defecto es 4, un valor
+            bajo para no saturar el servidor ni provocar bloqueos por exceso de
+            peticiones.
+
+        Returns
+        -------
+        list
+            Lista con la información de cada anuncio, en el mismo orden que urls.
+            Los anuncios que han fallado contienen la excepción en lugar del
+            diccionario, por lo que conviene filtrarlos con
+            isinstance(resultado, Exception).
+        """
+
+        def scrape_url(url):
+            # Capturar el error de cada anuncio para no perder los demás
+            # resultados (executor.map relanza la primera excepción)
+            try:
+                return cls(url).scrape()
+            except Exception as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(scrape_url, urls))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Permitir importar el paquete src desde los tests sin instalarlo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
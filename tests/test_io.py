@@ -0,0 +1,56 @@
+import pandas as pd
+
+from src.data.io import save_df_to_parquet
+
+
+def _save_and_read(tmp_path, *dataframes):
+    for dataframe in dataframes:
+        save_df_to_parquet(dataframe, str(tmp_path), "anuncios", replace=True)
+    return pd.read_parquet(tmp_path / "anuncios.parquet")
+
+
+def test_append_column_null_then_string(tmp_path):
+    result = _save_and_read(
+        tmp_path,
+        pd.DataFrame({"id": [1], "orientacion": [None]}),
+        pd.DataFrame({"id": [2], "orientacion": ["sur"]}),
+    )
+
+    assert result["id"].tolist() == [1, 2]
+    assert result["orientacion"].tolist() == [None, "sur"]
+
+
+def test_append_new_struct_key(tmp_path):
+    result = _save_and_read(
+        tmp_path,
+        pd.DataFrame({"certificado": [{"Consumo:": "A"}]}),
+        pd.DataFrame({"certificado": [{"Consumo:": "B", "Emisiones:": "C"}]}),
+    )
+
+    assert result["certificado"].tolist() == [
+        {"Consumo:": "A", "Emisiones:": None},
+        {"Consumo:": "B", "Emisiones:": "C"},
+    ]
+
+
+def test_append_int_then_float(tmp_path):
+    result = _save_and_read(
+        tmp_path,
+        pd.DataFrame({"precio_m2": [2000]}),
+        pd.DataFrame({"precio_m2": [1.5]}),
+    )
+
+    assert result["precio_m2"].tolist() == [2000.0, 1.5]
+
+
+def test_append_same_schema_keeps_fragments(tmp_path):
+    result = _save_and_read(
+        tmp_path,
+        pd.DataFrame({"id": [1], "orientacion": ["norte"]}),
+        pd.DataFrame({"id": [2], "orientacion": ["sur"]}),
+        pd.DataFrame({"id": [3], "orientacion": [None]}),
+    )
+
+    assert len(list((tmp_path / "anuncios.parquet").iterdir())) == 3
+    assert result["id"].tolist() == [1, 2, 3]
+    assert result["orientacion"].tolist() == ["norte", "sur", None]
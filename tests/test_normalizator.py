@@ -0,0 +1,80 @@
+import pandas as pd
+
+from src.data.normalizator import NormalizarDataFrame
+
+
+def _anuncios(**columnas):
+    n = len(next(iter(columnas.values())))
+    datos = {
+        "title": ["anuncio"] * n,
+        "price": ["1"] * n,
+        "info_features": [["85 m²", "3 hab."]] * n,
+        "caracteristicas_basicas": [["2 baños"]] * n,
+        "certificado_energetico": [[]] * n,
+        "Precio del inmueble:": ["250.000 €"] * n,
+        "Precio por m²:": ["12,50 €/m²"] * n,
+    }
+    datos.update(columnas)
+    return pd.DataFrame(datos)
+
+
+def test_normalize_dataframe_does_not_modify_input():
+    df = _anuncios(title=["a", "b"])
+    normalizador = NormalizarDataFrame(df)
+
+    primero = normalizador.normalize_dataframe()
+    segundo = normalizador.normalize_dataframe()
+
+    assert list(df.columns) == list(_anuncios(title=["a"]).columns)
+    pd.testing.assert_frame_equal(primero, segundo)
+    assert primero["superficie_m2"].tolist() == [85, 85]
+
+
+def test_normalizar_precios_separadores_y_unidades():
+    df = _anuncios(
+        **{
+            "Precio del inmueble:": ["250.000 €", "250.000\xa0€", "250.000€", None],
+            "Precio por m²:": [
+                "12,50 €/m²",
+                "12,50\xa0€/m²",
+                "2.083,33€/m²",
+                None,
+            ],
+        }
+    )
+
+    resultado = NormalizarDataFrame(df).normalize_dataframe()
+
+    assert resultado["precio_inmueble"].tolist() == [250000, 250000, 250000, pd.NA]
+    assert resultado["precio_m2"].tolist()[:3] == [12.5, 12.5, 2083.33]
+    assert resultado["precio_m2"].isna().tolist() == [False, False, False, True]
+
+
+def test_caracteristicas_basicas_por_anuncio_y_vectorizadas_coinciden():
+    caracteristicas = [
+        ["90 m² construidos, 80 m² útiles", "3 habitaciones", "2 baños"],
+        ["Orientación norte, sur", "Calefacción individual: Gas natural "],
+        ["Parcela de 300 m²", "2 plantas", "Amueblado", "Construido en 1975"],
+        [],
+    ]
+    normalizador = NormalizarDataFrame(pd.DataFrame())
+    texto = pd.Series([" ".join(c).lower() for c in caracteristicas])
+
+    vectorizadas = normalizador.extract_caracteristicas_basicas_columns(texto)
+    por_anuncio = pd.DataFrame(
+        [normalizador.extract_caracteristicas_basicas(c) for c in caracteristicas]
+    )
+
+    assert list(vectorizadas.columns) == list(por_anuncio.columns)
+    for columna in vectorizadas.columns:
+        esperado = (
+            por_anuncio[columna]
+            .astype(object)
+            .where(por_anuncio[columna].notna(), None)
+        )
+        obtenido = (
+            vectorizadas[columna]
+            .astype(object)
+            .where(vectorizadas[columna].notna(), None)
+        )
+        assert obtenido.tolist() == esperado.tolist(), columna
@@ -0,0 +1,16 @@
+from src.scrapper import IdealistaScraper
+
+
+def test_scrape_many_keeps_results_of_other_urls(monkeypatch):
+    def scrape(self):
+        if "falla" in self.url:
+            raise ValueError("Error al obtener la página")
+        return {"url": self.url}
+
+    monkeypatch.setattr(IdealistaScraper, "scrape", scrape)
+
+    resultados = IdealistaScraper.scrape_many(["a", "falla", "b"])
+
+    assert resultados[0] == {"url": "a"}
+    assert isinstance(resultados[1], ValueError)
+    assert resultados[2] == {"url": "b"}